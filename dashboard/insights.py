@@ -2,6 +2,22 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+def _group_median(codes, values, ngroups):
+    """Per-group median over flat arrays of group codes and values"""
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    sorted_values = values[order]
+
+    group_ids = np.arange(ngroups)
+    starts = np.searchsorted(sorted_codes, group_ids, side='left')
+    ends = np.searchsorted(sorted_codes, group_ids, side='right')
+
+    medians = np.zeros(ngroups)
+    for g in group_ids:
+        if ends[g] > starts[g]:
+            medians[g] = np.median(sorted_values[starts[g]:ends[g]])
+    return medians
+
 class InsightsGenerator:
     """Generate financial insights and recommendations"""
     
@@ -15,25 +31,68 @@ class InsightsGenerator:
             'Utilities': 0.08,      # 8% of income
             'Healthcare': 0.05,     # 5% of income
         }
-    
+
+    @staticmethod
+    def _prepare(df):
+        """Normalize low-cardinality columns to categorical dtype so repeated
+        filters and groupbys compare integer codes instead of hashing strings,
+        and sort by date so date windows become searchsorted slices"""
+        df = df.sort_values('date')
+        df['type'] = df['type'].astype('category')
+        if 'category' in df.columns:
+            df['category'] = df['category'].astype('category')
+        df['month'] = df['date'].dt.to_period('M')
+        # Dollar amounts fit comfortably in float32; halving the bytes moved
+        # speeds up the sums and groupbys that dominate this module
+        df['amount'] = df['amount'].astype(np.float32)
+        return df
+
+    @staticmethod
+    def _summarize(df):
+        """One-pass summary of the totals shared by the recommendation and
+        health-score paths; expects a frame already run through _prepare"""
+        type_totals = df.groupby('type', observed=True)['amount'].sum()
+        total_income = float(type_totals.get('credit', 0.0))
+        total_expenses = float(type_totals.get('debit', 0.0))
+
+        credit_mask = df['type'] == 'credit'
+        summary = {
+            'total_income': total_income,
+            'total_expenses': total_expenses,
+            'savings_rate': ((total_income - total_expenses) / total_income * 100) if total_income > 0 else 0,
+            'monthly_income': df.loc[credit_mask].groupby('month')['amount'].sum(),
+            'monthly_expenses': df.loc[~credit_mask].groupby('month')['amount'].sum(),
+            'category_totals': None,
+        }
+        if 'category' in df.columns:
+            summary['category_totals'] = (
+                df.loc[~credit_mask].groupby('category', observed=True)['amount'].sum().sort_values(ascending=False)
+            )
+        return summary
+
     def analyze_spending_patterns(self, df):
         """Analyze spending patterns and identify trends"""
         insights = []
-        
+
         if df.empty or 'category' not in df.columns:
             return insights
-        
-        # Recent vs previous month comparison
-        current_date = df['date'].max()
+
+        df = self._prepare(df)
+        debit_mask = df['type'] == 'debit'
+
+        # Recent vs previous month comparison; _prepare sorted by date, so the
+        # max is the last element rather than a full reduction
+        current_date = df['date'].iat[-1]
         current_month_start = current_date.replace(day=1)
         previous_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
-        
-        current_month_df = df[df['date'] >= current_month_start]
-        previous_month_df = df[(df['date'] >= previous_month_start) & (df['date'] < current_month_start)]
-        
-        if not current_month_df.empty and not previous_month_df.empty:
-            current_spending = current_month_df[current_month_df['type'] == 'debit']['amount'].sum()
-            previous_spending = previous_month_df[previous_month_df['type'] == 'debit']['amount'].sum()
+
+        dates = df['date'].to_numpy()
+        current_start = np.searchsorted(dates, np.datetime64(current_month_start))
+        previous_start = np.searchsorted(dates, np.datetime64(previous_month_start))
+
+        if current_start < len(df) and previous_start < current_start:
+            current_spending = df['amount'].iloc[current_start:][debit_mask.iloc[current_start:]].sum()
+            previous_spending = df['amount'].iloc[previous_start:current_start][debit_mask.iloc[previous_start:current_start]].sum()
             
             if previous_spending > 0:
                 change_pct = ((current_spending - previous_spending) / previous_spending) * 100
@@ -50,17 +109,18 @@ class InsightsGenerator:
                     })
         
         # Category-wise trend analysis
-        expenses_df = df[df['type'] == 'debit']
+        expenses_df = df.loc[debit_mask]
         
         if not expenses_df.empty:
-            # Find fastest growing categories
-            df_with_month = expenses_df.copy()
-            df_with_month['month'] = df_with_month['date'].dt.to_period('M')
-            
-            monthly_category = df_with_month.groupby(['month', 'category'])['amount'].sum().unstack(fill_value=0)
-            
-            if len(monthly_category) >= 2:
-                category_growth = monthly_category.pct_change().iloc[-1] * 100
+            # Find fastest growing categories; only the last two months matter,
+            # so avoid pivoting the full history just to read one pct_change row
+            months = expenses_df['month'].drop_duplicates().sort_values()
+
+            if len(months) >= 2:
+                last_two_df = expenses_df[expenses_df['month'].isin(months.iloc[-2:])]
+                monthly_category = last_two_df.groupby(['month', 'category'], observed=True)['amount'].sum().unstack(fill_value=0)
+
+                category_growth = (monthly_category.iloc[-1] / monthly_category.iloc[-2].replace(0, np.nan) - 1) * 100
                 fastest_growing = category_growth.sort_values(ascending=False).head(3)
                 
                 for category, growth in fastest_growing.items():
@@ -78,90 +138,100 @@ class InsightsGenerator:
         
         if df.empty or 'category' not in df.columns:
             return budget_analysis
-        
+
+        df = self._prepare(df)
+
         # Calculate monthly income and expenses
-        current_date = df['date'].max()
+        current_date = df['date'].iat[-1]
         current_month_start = current_date.replace(day=1)
-        current_month_df = df[df['date'] >= current_month_start]
-        
-        monthly_income = current_month_df[current_month_df['type'] == 'credit']['amount'].sum()
-        
+        current_month_df = df.iloc[np.searchsorted(df['date'].to_numpy(), np.datetime64(current_month_start)):]
+        debit_mask = current_month_df['type'] == 'debit'
+
+        monthly_income = current_month_df.loc[~debit_mask, 'amount'].sum()
+
         if monthly_income <= 0:
             return budget_analysis
-        
-        expenses_df = current_month_df[current_month_df['type'] == 'debit']
-        category_spending = expenses_df.groupby('category')['amount'].sum()
-        
-        for category, recommended_pct in self.category_budgets.items():
-            if category in category_spending.index:
-                actual_amount = category_spending[category]
-                recommended_amount = monthly_income * recommended_pct
-                variance_pct = ((actual_amount - recommended_amount) / recommended_amount) * 100
-                
-                if variance_pct > 20:  # 20% over budget
-                    budget_analysis.append({
-                        'Category': category,
-                        'Actual Spending': f"${actual_amount:.2f}",
-                        'Recommended Budget': f"${recommended_amount:.2f}",
-                        'Variance': f"+{variance_pct:.1f}%",
-                        'Status': 'Over Budget',
-                        'Suggestion': f"Consider reducing {category.lower()} expenses by ${actual_amount - recommended_amount:.2f}"
-                    })
-                elif variance_pct < -20:  # 20% under budget
-                    budget_analysis.append({
-                        'Category': category,
-                        'Actual Spending': f"${actual_amount:.2f}",
-                        'Recommended Budget': f"${recommended_amount:.2f}",
-                        'Variance': f"{variance_pct:.1f}%",
-                        'Status': 'Under Budget',
-                        'Suggestion': "Great job staying within budget!"
-                    })
-        
+
+        expenses_df = current_month_df.loc[debit_mask]
+        category_spending = expenses_df.groupby('category', observed=True)['amount'].sum().to_dict()
+
+        # Compute the variances up front with plain dict lookups; rows are only
+        # formatted for the categories that actually cross the threshold
+        budgeted = [(category, pct) for category, pct in self.category_budgets.items()
+                    if category in category_spending]
+        actuals = np.array([category_spending[category] for category, _ in budgeted])
+        recommended = monthly_income * np.array([pct for _, pct in budgeted])
+        variance_pcts = (actuals - recommended) / recommended * 100
+
+        for (category, _), actual_amount, recommended_amount, variance_pct in zip(
+                budgeted, actuals, recommended, variance_pcts):
+            if variance_pct > 20:  # 20% over budget
+                budget_analysis.append({
+                    'Category': category,
+                    'Actual Spending': f"${actual_amount:.2f}",
+                    'Recommended Budget': f"${recommended_amount:.2f}",
+                    'Variance': f"+{variance_pct:.1f}%",
+                    'Status': 'Over Budget',
+                    'Suggestion': f"Consider reducing {category.lower()} expenses by ${actual_amount - recommended_amount:.2f}"
+                })
+            elif variance_pct < -20:  # 20% under budget
+                budget_analysis.append({
+                    'Category': category,
+                    'Actual Spending': f"${actual_amount:.2f}",
+                    'Recommended Budget': f"${recommended_amount:.2f}",
+                    'Variance': f"{variance_pct:.1f}%",
+                    'Status': 'Under Budget',
+                    'Suggestion': "Great job staying within budget!"
+                })
+
         return budget_analysis
     
     def flag_unusual_transactions(self, df, threshold_multiplier=2.0):
         """Flag unusually large transactions"""
         if df.empty:
             return pd.DataFrame()
-        
+
+        df = self._prepare(df)
+        debit_mask = df['type'] == 'debit'
+
         # Calculate monthly income average
-        monthly_income = df[df['type'] == 'credit'].groupby(df['date'].dt.to_period('M'))['amount'].sum()
+        monthly_income = df.loc[~debit_mask].groupby('month')['amount'].sum()
         avg_monthly_income = monthly_income.mean() if not monthly_income.empty else 0
-        
+
         if avg_monthly_income <= 0:
             return pd.DataFrame()
-        
+
         # Flag transactions that are more than 20% of monthly income
         large_transaction_threshold = avg_monthly_income * 0.2
-        
-        unusual_transactions = df[
-            (df['type'] == 'debit') & 
-            (df['amount'] > large_transaction_threshold)
-        ].copy()
-        
+
+        unusual_mask = debit_mask & (df['amount'] > large_transaction_threshold)
+
         # Also flag transactions that are statistical outliers within their category
         if 'category' in df.columns:
-            expenses_df = df[df['type'] == 'debit']
-            category_stats = expenses_df.groupby('category')['amount'].agg(['mean', 'std']).fillna(0)
-            
-            outlier_transactions = []
-            for _, transaction in expenses_df.iterrows():
-                category = transaction['category']
-                amount = transaction['amount']
-                
-                if category in category_stats.index:
-                    mean_amount = category_stats.loc[category, 'mean']
-                    std_amount = category_stats.loc[category, 'std']
-                    
-                    if std_amount > 0:
-                        z_score = (amount - mean_amount) / std_amount
-                        if z_score > threshold_multiplier:
-                            outlier_transactions.append(transaction)
-            
-            if outlier_transactions:
-                outlier_df = pd.DataFrame(outlier_transactions)
-                unusual_transactions = pd.concat([unusual_transactions, outlier_df]).drop_duplicates()
-        
+            codes = df['category'].cat.codes.to_numpy()
+            amounts = df['amount'].to_numpy(np.float64)
+            valid = codes >= 0
+
+            expense_rows = debit_mask.to_numpy() & valid
+            ngroups = len(df['category'].cat.categories)
+
+            # An all-NaN category column yields zero groups; skip the MAD
+            # pass and let the income-threshold mask stand on its own
+            if ngroups > 0 and valid.any():
+                # Modified z-score (median + MAD) is robust to the skew of
+                # spending data, where a few big purchases inflate the std
+                # enough to mask real outliers
+                medians = _group_median(codes[expense_rows], amounts[expense_rows], ngroups)
+                abs_deviation = np.abs(amounts[expense_rows] - medians[codes[expense_rows]])
+                mads = _group_median(codes[expense_rows], abs_deviation, ngroups)
+
+                safe_codes = np.where(valid, codes, 0)
+                row_mad = mads[safe_codes]
+                modified_z = 0.6745 * (amounts - medians[safe_codes]) / np.where(row_mad > 0, row_mad, np.inf)
+                modified_z[~valid] = 0.0
+                unusual_mask |= debit_mask & (modified_z > threshold_multiplier)
+
+        unusual_transactions = df[unusual_mask]
         return unusual_transactions.sort_values('amount', ascending=False) if not unusual_transactions.empty else pd.DataFrame()
     
     def generate_recommendations(self, df):
@@ -170,11 +240,13 @@ class InsightsGenerator:
         
         if df.empty:
             return recommendations
-        
-        # Calculate basic financial metrics
-        total_income = df[df['type'] == 'credit']['amount'].sum()
-        total_expenses = df[df['type'] == 'debit']['amount'].sum()
-        savings_rate = ((total_income - total_expenses) / total_income * 100) if total_income > 0 else 0
+
+        df = self._prepare(df)
+        summary = self._summarize(df)
+
+        total_income = summary['total_income']
+        total_expenses = summary['total_expenses']
+        savings_rate = summary['savings_rate']
         
         # Savings rate recommendations
         if savings_rate < 10:
@@ -184,37 +256,22 @@ class InsightsGenerator:
         else:
             recommendations.append("Excellent savings rate! Consider investing your surplus for long-term wealth building.")
         
-        # Category-specific recommendations
-        if 'category' in df.columns:
-            expenses_df = df[df['type'] == 'debit']
-            category_totals = expenses_df.groupby('category')['amount'].sum().sort_values(ascending=False)
-            
-            # Food & Dining recommendations
-            if 'Food & Dining' in category_totals.index:
-                food_spending = category_totals['Food & Dining']
-                food_pct = (food_spending / total_expenses) * 100 if total_expenses > 0 else 0
-                
-                if food_pct > 25:
-                    recommendations.append("You're spending over 25% of your budget on dining out. Consider meal planning and cooking at home more often.")
-            
-            # Transportation recommendations
-            if 'Transportation' in category_totals.index:
-                transport_spending = category_totals['Transportation']
-                transport_pct = (transport_spending / total_expenses) * 100 if total_expenses > 0 else 0
-                
-                if transport_pct > 20:
-                    recommendations.append("Transportation costs are high. Consider carpooling, public transport, or working from home if possible.")
-            
-            # Shopping recommendations
-            if 'Shopping' in category_totals.index:
-                shopping_spending = category_totals['Shopping']
-                shopping_pct = (shopping_spending / total_expenses) * 100 if total_expenses > 0 else 0
-                
-                if shopping_pct > 15:
-                    recommendations.append("Consider implementing a 24-hour rule before making non-essential purchases to reduce impulse buying.")
+        # Category-specific recommendations; share of expenses is computed for
+        # all categories in one vectorized pass, then compared per threshold
+        if summary['category_totals'] is not None and total_expenses > 0:
+            category_pcts = (summary['category_totals'] / total_expenses * 100).to_dict()
+
+            if category_pcts.get('Food & Dining', 0) > 25:
+                recommendations.append("You're spending over 25% of your budget on dining out. Consider meal planning and cooking at home more often.")
+
+            if category_pcts.get('Transportation', 0) > 20:
+                recommendations.append("Transportation costs are high. Consider carpooling, public transport, or working from home if possible.")
+
+            if category_pcts.get('Shopping', 0) > 15:
+                recommendations.append("Consider implementing a 24-hour rule before making non-essential purchases to reduce impulse buying.")
         
         # Emergency fund recommendation
-        monthly_expenses = total_expenses / max(1, len(df['date'].dt.to_period('M').unique()))
+        monthly_expenses = total_expenses / max(1, df['month'].nunique())
         emergency_fund_target = monthly_expenses * 6
         
         recommendations.append(f"Build an emergency fund of ${emergency_fund_target:,.2f} (6 months of expenses) for financial security.")
@@ -229,14 +286,15 @@ class InsightsGenerator:
         """Calculate a financial health score from 0-100"""
         if df.empty:
             return 0
-        
+
+        df = self._prepare(df)
+        summary = self._summarize(df)
+
         score = 0
         max_score = 100
-        
+
         # Savings rate (30 points)
-        total_income = df[df['type'] == 'credit']['amount'].sum()
-        total_expenses = df[df['type'] == 'debit']['amount'].sum()
-        savings_rate = ((total_income - total_expenses) / total_income * 100) if total_income > 0 else 0
+        savings_rate = summary['savings_rate']
         
         if savings_rate >= 20:
             score += 30
@@ -247,21 +305,22 @@ class InsightsGenerator:
         
         # Budget adherence (25 points)
         if 'category' in df.columns:
-            current_date = df['date'].max()
+            current_date = df['date'].iat[-1]
             current_month_start = current_date.replace(day=1)
-            current_month_df = df[df['date'] >= current_month_start]
-            
-            monthly_income = current_month_df[current_month_df['type'] == 'credit']['amount'].sum()
+            current_month_df = df.iloc[np.searchsorted(df['date'].to_numpy(), np.datetime64(current_month_start)):]
+            month_debit_mask = current_month_df['type'] == 'debit'
+
+            monthly_income = current_month_df.loc[~month_debit_mask, 'amount'].sum()
             
             if monthly_income > 0:
                 budget_adherence_score = 0
                 categories_checked = 0
                 
-                expenses_df = current_month_df[current_month_df['type'] == 'debit']
-                category_spending = expenses_df.groupby('category')['amount'].sum()
-                
+                expenses_df = current_month_df.loc[month_debit_mask]
+                category_spending = expenses_df.groupby('category', observed=True)['amount'].sum().to_dict()
+
                 for category, recommended_pct in self.category_budgets.items():
-                    if category in category_spending.index:
+                    if category in category_spending:
                         actual_amount = category_spending[category]
                         recommended_amount = monthly_income * recommended_pct
                         
@@ -283,9 +342,8 @@ class InsightsGenerator:
             score += 10
         
         # Income stability (25 points)
-        income_df = df[df['type'] == 'credit']
-        if not income_df.empty:
-            monthly_income = income_df.groupby(income_df['date'].dt.to_period('M'))['amount'].sum()
+        monthly_income = summary['monthly_income']
+        if not monthly_income.empty:
             income_cv = monthly_income.std() / monthly_income.mean() if monthly_income.mean() > 0 else float('inf')
             
             if income_cv < 0.1:  # Very stable income
@@ -8,31 +8,57 @@ from datetime import datetime, timedelta
 class DashboardVisualizations:
     """Create various visualizations for the financial dashboard"""
     
+    # Class-level and immutable: instances share one palette instead of
+    # allocating a fresh list per construction
+    color_palette = (
+        '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7',
+        '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9'
+    )
+
     def __init__(self):
-        self.color_palette = [
-            '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7',
-            '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9'
-        ]
+        self._pivot_cache = {}
+
+    def _monthly_pivot(self, df):
+        """Month x type pivot of summed amounts, memoized per DataFrame so the
+        trends and savings-rate charts share a single groupby per render"""
+        # Content-derived key: object ids get recycled across reruns (and
+        # the instance is shared via st.cache_resource), so the window
+        # endpoints plus a hashed row sample identify the frame instead
+        sample = df['amount'].iloc[::max(1, len(df) // 16)]
+        key = (
+            len(df),
+            df['date'].iat[0],
+            df['date'].iat[-1],
+            int(pd.util.hash_pandas_object(sample, index=False).sum())
+        )
+        pivot = self._pivot_cache.get(key)
+        if pivot is None:
+            month = df['date'].dt.to_period('M').rename('month')
+            pivot = df.groupby([month, 'type'])['amount'].sum().unstack(fill_value=0)
+            # Keep only the most recent frame to bound memory
+            self._pivot_cache = {key: pivot}
+        return pivot
     
     def create_monthly_trends_chart(self, df):
         """Create monthly income vs expense trends chart"""
         if df.empty:
             return go.Figure()
         
-        df = df.copy()
-        df['month'] = df['date'].dt.to_period('M').astype(str)
-        
-        monthly_data = df.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
+        monthly_data = self._monthly_pivot(df)
         
         if monthly_data.empty:
             return go.Figure()
         
+        # Plain NumPy arrays serialize much more cheaply than pandas
+        # Index/Series objects when Plotly converts the figure to JSON
+        month_labels = monthly_data.index.astype(str).to_numpy()
+        
         fig = go.Figure()
         
         if 'credit' in monthly_data.columns:
             fig.add_trace(go.Scatter(
-                x=monthly_data.index,
-                y=monthly_data['credit'],
+                x=month_labels,
+                y=monthly_data['credit'].to_numpy(np.float32),
                 mode='lines+markers',
                 name='Income',
                 line=dict(color='#4ECDC4', width=3),
@@ -41,8 +67,8 @@ class DashboardVisualizations:
         
         if 'debit' in monthly_data.columns:
             fig.add_trace(go.Scatter(
-                x=monthly_data.index,
-                y=monthly_data['debit'],
+                x=month_labels,
+                y=monthly_data['debit'].to_numpy(np.float32),
                 mode='lines+markers',
                 name='Expenses',
                 line=dict(color='#FF6B6B', width=3),
@@ -51,9 +77,9 @@ class DashboardVisualizations:
         
         # Add savings line
         if 'credit' in monthly_data.columns and 'debit' in monthly_data.columns:
-            savings = monthly_data['credit'] - monthly_data['debit']
+            savings = (monthly_data['credit'] - monthly_data['debit']).to_numpy(np.float32)
             fig.add_trace(go.Scatter(
-                x=monthly_data.index,
+                x=month_labels,
                 y=savings,
                 mode='lines+markers',
                 name='Net Savings',
@@ -66,7 +92,8 @@ class DashboardVisualizations:
             xaxis_title='Month',
             yaxis_title='Amount ($)',
             hovermode='x unified',
-            height=400
+            height=400,
+            uirevision='static'
         )
         
         return fig
@@ -81,8 +108,11 @@ class DashboardVisualizations:
         if expenses_df.empty:
             return go.Figure()
         
-        category_totals = expenses_df.groupby('category')['amount'].sum().sort_values(ascending=False)
-        
+        category_totals = expenses_df.groupby('category', observed=True)['amount'].sum().sort_values(ascending=False)
+        # Plain string index so inserting the "Other" bucket below works
+        # when the category column is categorical
+        category_totals.index = category_totals.index.astype(str)
+
         # Group smaller categories into "Other"
         top_categories = category_totals.head(8)
         other_amount = category_totals.tail(-8).sum()
@@ -94,7 +124,7 @@ class DashboardVisualizations:
             values=top_categories.values,
             names=top_categories.index,
             title='Expense Distribution by Category',
-            color_discrete_sequence=self.color_palette
+            color_discrete_sequence=list(self.color_palette)
         )
         
         fig.update_traces(
@@ -117,7 +147,7 @@ class DashboardVisualizations:
         if expenses_df.empty:
             return go.Figure()
         
-        category_totals = expenses_df.groupby('category')['amount'].sum().sort_values(ascending=True).tail(10)
+        category_totals = expenses_df.groupby('category', observed=True)['amount'].sum().sort_values(ascending=True).tail(10)
         
         fig = go.Figure(go.Bar(
             x=category_totals.values,
@@ -143,7 +173,12 @@ class DashboardVisualizations:
         if df.empty:
             return go.Figure()
         
-        current_date = df['date'].max()
+        # One pass over the frame: sort by date, build cumulative income and
+        # expense sums, then every window total is a subtraction at a
+        # searchsorted index instead of a fresh full-frame filter
+        sorted_df = df.sort_values('date')
+        dates = sorted_df['date'].to_numpy()
+        current_date = sorted_df['date'].iat[-1]
         
         periods = {
             'Last 1 Month': current_date - timedelta(days=30),
@@ -152,16 +187,22 @@ class DashboardVisualizations:
             'Last 12 Months': current_date - timedelta(days=365)
         }
         
+        amounts = sorted_df['amount'].to_numpy(np.float64)
+        is_credit = (sorted_df['type'] == 'credit').to_numpy()
+
+        cum_income = np.cumsum(np.where(is_credit, amounts, 0.0))
+        cum_expenses = np.cumsum(np.where(is_credit, 0.0, amounts))
+
         comparison_data = []
-        
+
         for period_name, start_date in periods.items():
-            period_df = df[df['date'] >= start_date]
-            
-            if not period_df.empty:
-                total_income = period_df[period_df['type'] == 'credit']['amount'].sum()
-                total_expenses = period_df[period_df['type'] == 'debit']['amount'].sum()
+            idx = np.searchsorted(dates, np.datetime64(start_date))
+
+            if idx < len(dates):
+                total_income = cum_income[-1] - (cum_income[idx - 1] if idx > 0 else 0.0)
+                total_expenses = cum_expenses[-1] - (cum_expenses[idx - 1] if idx > 0 else 0.0)
                 net_savings = total_income - total_expenses
-                
+
                 comparison_data.append({
                     'Period': period_name,
                     'Income': total_income,
@@ -219,8 +260,12 @@ class DashboardVisualizations:
         if df.empty:
             return go.Figure()
         
-        recent_date = df['date'].max() - timedelta(days=days)
-        recent_df = df[df['date'] >= recent_date]
+        # Slice the window off a date-sorted frame instead of allocating a
+        # full-length boolean mask
+        sorted_df = df.sort_values('date')
+        recent_date = sorted_df['date'].iat[-1] - timedelta(days=days)
+        start = np.searchsorted(sorted_df['date'].to_numpy(), np.datetime64(recent_date))
+        recent_df = sorted_df.iloc[start:]
         
         if recent_df.empty:
             return go.Figure()
@@ -263,22 +308,19 @@ class DashboardVisualizations:
         if df.empty:
             return go.Figure()
         
-        df = df.copy()
-        df['month'] = df['date'].dt.to_period('M')
-        
-        monthly_data = df.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
+        monthly_data = self._monthly_pivot(df)
         
         if monthly_data.empty or 'credit' not in monthly_data.columns:
             return go.Figure()
         
-        monthly_data['savings_rate'] = ((monthly_data.get('credit', 0) - monthly_data.get('debit', 0)) / 
-                                       monthly_data['credit'] * 100).fillna(0)
+        savings_rate = ((monthly_data.get('credit', 0) - monthly_data.get('debit', 0)) /
+                        monthly_data['credit'] * 100).fillna(0)
         
         fig = go.Figure()
         
         fig.add_trace(go.Scatter(
-            x=monthly_data.index.astype(str),
-            y=monthly_data['savings_rate'],
+            x=monthly_data.index.astype(str).to_numpy(),
+            y=savings_rate.to_numpy(np.float32),
             mode='lines+markers',
             name='Savings Rate',
             line=dict(color='#45B7D1', width=3),
@@ -299,7 +341,8 @@ class DashboardVisualizations:
             xaxis_title='Month',
             yaxis_title='Savings Rate (%)',
             hovermode='x unified',
-            height=300
+            height=300,
+            uirevision='static'
         )
         
         return fig
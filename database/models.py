@@ -2,9 +2,11 @@
 Database models for the Finance Tracker application
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, Float, Numeric, Date, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship, declarative_base
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker, scoped_session, relationship, declarative_base
 from datetime import datetime
 import os
 
@@ -20,9 +22,10 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
     
-    # Relationships
-    bank_accounts = relationship("BankAccount", back_populates="user", cascade="all, delete-orphan")
-    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
+    # Relationships: lazy='raise_on_sql' so accidental N+1 access fails
+    # loudly; call sites declare eager loading explicitly
+    bank_accounts = relationship("BankAccount", back_populates="user", cascade="all, delete-orphan", lazy='raise_on_sql')
+    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan", lazy='raise_on_sql')
 
 class BankAccount(Base):
     """Bank account model"""
@@ -38,21 +41,32 @@ class BankAccount(Base):
     is_active = Column(Boolean, default=True)
     
     # Relationships
-    user = relationship("User", back_populates="bank_accounts")
-    transactions = relationship("Transaction", back_populates="bank_account", cascade="all, delete-orphan")
+    user = relationship("User", back_populates="bank_accounts", lazy='raise_on_sql')
+    transactions = relationship("Transaction", back_populates="bank_account", cascade="all, delete-orphan", lazy='raise_on_sql')
 
 class Transaction(Base):
     """Transaction model"""
     __tablename__ = 'transactions'
-    
+    __table_args__ = (
+        # Composite indexes for the hot paths: date-ranged user queries,
+        # duplicate detection, and per-type / per-category analytics
+        Index('ix_tx_user_date', 'user_id', 'date'),
+        Index('ix_tx_user_hash', 'user_id', 'transaction_hash', unique=True),
+        Index('ix_tx_user_type_date', 'user_id', 'transaction_type', 'date'),
+        Index('ix_tx_user_cat', 'user_id', 'category'),
+    )
+
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     bank_account_id = Column(Integer, ForeignKey('bank_accounts.id'), nullable=False)
     
-    # Transaction details
-    date = Column(DateTime, nullable=False)
+    # Transaction details; bank statements are day-granular and the dedup
+    # hash already discards time-of-day
+    date = Column(Date, nullable=False)
     description = Column(Text, nullable=False)
-    amount = Column(Float, nullable=False)
+    # Fixed-point at the DB level so SUM/AVG don't drift; asdecimal=False
+    # keeps hydration returning plain floats for pandas
+    amount = Column(Numeric(12, 2, asdecimal=False), nullable=False)
     transaction_type = Column(String(10), nullable=False)  # credit, debit
     category = Column(String(50), default='Other')
     
@@ -65,8 +79,8 @@ class Transaction(Base):
     transaction_hash = Column(String(64), index=True)
     
     # Relationships
-    user = relationship("User", back_populates="transactions")
-    bank_account = relationship("BankAccount", back_populates="transactions")
+    user = relationship("User", back_populates="transactions", lazy='raise_on_sql')
+    bank_account = relationship("BankAccount", back_populates="transactions", lazy='raise_on_sql')
 
 class UploadedFile(Base):
     """Track uploaded files to prevent re-processing"""
@@ -124,23 +138,89 @@ def get_database_url():
     """Get database URL from environment variables, default to SQLite"""
     return os.getenv('DATABASE_URL', 'sqlite:///finance.db')
 
+# One engine for the whole process: the connection pool and the compiled
+# statement cache live on the Engine, so rebuilding it per session would
+# throw both away
+ENGINE = create_engine(
+    get_database_url(),
+    echo=os.getenv('DEBUG_SQL') == '1',
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20,
+    future=True
+)
+# Instances stay readable after commit and queries don't trigger a flush
+# cycle first; writes flush explicitly on commit
+SessionLocal = sessionmaker(bind=ENGINE, expire_on_commit=False, autoflush=False)
+
+# Thread-local registry: every manager in the same thread shares one
+# session (and its pooled connection) instead of checking out a new one
+Session = scoped_session(SessionLocal)
+
+if ENGINE.dialect.name == 'sqlite':
+    @event.listens_for(ENGINE, 'connect')
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        """Tune SQLite for this write-heavy workload.
+
+        WAL lets readers run alongside the writer and synchronous=NORMAL
+        drops the per-commit fsync while keeping transactions durable on
+        application crash.
+        """
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
 def create_engine_instance():
-    """Create SQLAlchemy engine"""
-    database_url = get_database_url()
-    return create_engine(database_url, echo=True)
+    """Return the shared SQLAlchemy engine"""
+    return ENGINE
 
 def get_session():
-    """Get a database session"""
-    engine = create_engine_instance()
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+    """Get the thread-local database session"""
+    return Session()
 
 def init_database():
     """Initialize database schema and return session factory"""
-    engine = create_engine_instance()
-    Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine)    
-    # Create default categories
+    Base.metadata.create_all(ENGINE)
+
+    # Databases written while transactions.date was a DateTime column
+    # store '... 00:00:00.000000' strings that the SQLite Date result
+    # processor rejects; truncate them to plain ISO dates once
+    if ENGINE.dialect.name == 'sqlite':
+        with ENGINE.begin() as conn:
+            legacy_dates = conn.execute(text(
+                "SELECT 1 FROM transactions WHERE length(date) > 10 LIMIT 1"
+            )).scalar()
+            if legacy_dates:
+                conn.execute(text(
+                    "UPDATE transactions SET date = substr(date, 1, 10) "
+                    "WHERE length(date) > 10"
+                ))
+
+    # create_all skips tables that already exist, so databases created
+    # before the composite indexes never got them — and save_transactions'
+    # ON CONFLICT insert fails outright without the unique
+    # (user_id, transaction_hash) index. Backfill whatever is missing.
+    existing = {ix['name'] for ix in inspect(ENGINE).get_indexes(Transaction.__tablename__)}
+    missing = [ix for ix in Transaction.__table__.indexes if ix.name not in existing]
+    if missing:
+        if any(ix.unique for ix in missing):
+            # Drop duplicate rows the unique index would reject, keeping
+            # the earliest import of each (user, hash) pair
+            with ENGINE.begin() as conn:
+                conn.execute(text(
+                    "DELETE FROM transactions WHERE id NOT IN ("
+                    "SELECT MIN(id) FROM transactions "
+                    "GROUP BY user_id, transaction_hash)"
+                ))
+        for index in missing:
+            index.create(ENGINE, checkfirst=True)
+
+    # Create default categories; an early return used to leave this dead.
+    # One upsert seeds all of them, skipping names that already exist.
     session = get_session()
     try:
         default_categories = [
@@ -157,16 +237,18 @@ def init_database():
             {'name': 'Salary/Income', 'color': '#58D68D'},
             {'name': 'Other', 'color': '#BDC3C7'}
         ]
-        
-        for cat_data in default_categories:
-            existing = session.query(Category).filter_by(name=cat_data['name']).first()
-            if not existing:
-                category = Category(**cat_data)
-                session.add(category)
-        
+
+        dialect_insert = sqlite_insert if ENGINE.dialect.name == 'sqlite' else pg_insert
+        session.execute(
+            dialect_insert(Category).values(default_categories).on_conflict_do_nothing(
+                index_elements=['name']
+            )
+        )
         session.commit()
     except Exception as e:
         session.rollback()
         print(f"Error initializing categories: {e}")
     finally:
         session.close()
+
+    return SessionLocal
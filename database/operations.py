@@ -2,16 +2,41 @@
 Database operations for the Finance Tracker application
 """
 
+import os
 import pandas as pd
 import hashlib
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import and_, or_, func, desc
+from dateutil.relativedelta import relativedelta
+from sqlalchemy.orm import sessionmaker, selectinload
+from sqlalchemy import and_, or_, func, desc, select, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from .models import (
     User, BankAccount, Transaction, UploadedFile, Category, 
     UserPreference, FinancialGoal, get_session, init_database
 )
 
+# Hot fixed-shape lookups, built once with bound parameters so repeated
+# calls hit the engine's compiled-statement cache with a stable key
+_USER_BY_NAME_STMT = select(User).where(User.username == bindparam('username'))
+_USER_BY_ID_STMT = select(User).where(User.id == bindparam('uid'))
+_ACCOUNT_STMT = select(BankAccount).where(
+    BankAccount.user_id == bindparam('uid'),
+    BankAccount.bank_name == bindparam('bank'),
+    BankAccount.account_name == bindparam('account')
+)
+_FILE_HASH_STMT = select(UploadedFile.id).where(
+    UploadedFile.file_hash == bindparam('file_hash')
+)
+
+@lru_cache(maxsize=4096)
+def _file_hash_exists(file_hash):
+    """Memoized file-hash lookup; UI reruns re-check the same upload"""
+    session = get_session()
+    return session.execute(_FILE_HASH_STMT, {'file_hash': file_hash}).first() is not None
+
 class DatabaseManager:
     """Manages all database operations"""
     
@@ -43,7 +68,7 @@ class UserManager(DatabaseManager):
         """Create or get existing user"""
         session = self.get_session()
         try:
-            user = session.query(User).filter_by(username=username).first()
+            user = session.execute(_USER_BY_NAME_STMT, {'username': username}).scalars().first()
             if not user:
                 user = User(username=username, email=email)
                 session.add(user)
@@ -56,7 +81,7 @@ class UserManager(DatabaseManager):
     def get_user_by_id(self, user_id):
         """Get user by ID"""
         session = self.get_session()
-        return session.query(User).filter_by(id=user_id).first()
+        return session.execute(_USER_BY_ID_STMT, {'uid': user_id}).scalars().first()
 
 class BankAccountManager(DatabaseManager):
     """Manages bank account operations"""
@@ -65,11 +90,11 @@ class BankAccountManager(DatabaseManager):
         """Create or get bank account"""
         session = self.get_session()
         try:
-            account = session.query(BankAccount).filter_by(
-                user_id=user_id, 
-                bank_name=bank_name, 
-                account_name=account_name
-            ).first()
+            account = session.execute(_ACCOUNT_STMT, {
+                'uid': user_id,
+                'bank': bank_name,
+                'account': account_name
+            }).scalars().first()
             
             if not account:
                 account = BankAccount(
@@ -97,47 +122,81 @@ class TransactionManager(DatabaseManager):
         """Generate hash for duplicate detection"""
         hash_string = f"{date.strftime('%Y%m%d')}{amount}{description}"
         return hashlib.sha256(hash_string.encode()).hexdigest()
+
+    def generate_transaction_hashes(self, transactions_df):
+        """Generate duplicate-detection hashes for a whole DataFrame at once.
+
+        The concatenation is done in C via pandas string ops and SHA-256 is
+        only computed for unique values, then mapped back to every row.
+        """
+        hash_strings = (
+            transactions_df['date'].dt.strftime('%Y%m%d')
+            + transactions_df['amount'].astype(str)
+            + transactions_df['description']
+        )
+        unique_strings = hash_strings.drop_duplicates()
+
+        if len(unique_strings) > 50000:
+            # hashlib releases the GIL inside update(), so hashing very
+            # large imports scales across threads
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                digests = dict(zip(unique_strings, executor.map(
+                    lambda s: hashlib.sha256(s.encode()).hexdigest(),
+                    unique_strings, chunksize=1024
+                )))
+        else:
+            digests = {
+                s: hashlib.sha256(s.encode()).hexdigest()
+                for s in unique_strings
+            }
+        return hash_strings.map(digests)
     
     def save_transactions(self, transactions_df, user_id, bank_account_id, file_name=None):
         """Save transactions to database"""
         session = self.get_session()
-        saved_count = 0
-        duplicate_count = 0
-        
+
+        if transactions_df.empty:
+            return 0, 0
+
         try:
-            for _, row in transactions_df.iterrows():
-                # Generate hash for duplicate detection
-                tx_hash = self.generate_transaction_hash(row['date'], row['amount'], row['description'])
-                
-                # Check for existing transaction
-                existing = session.query(Transaction).filter_by(
-                    user_id=user_id,
-                    transaction_hash=tx_hash
-                ).first()
-                
-                if existing:
-                    duplicate_count += 1
-                    continue
-                
-                # Create new transaction
-                transaction = Transaction(
-                    user_id=user_id,
-                    bank_account_id=bank_account_id,
-                    date=row['date'],
-                    description=row['description'],
-                    amount=row['amount'],
-                    transaction_type=row['type'],
-                    category=row.get('category', 'Other'),
-                    original_file_name=file_name,
-                    transaction_hash=tx_hash
+            # Compute all hashes in one vectorized pass instead of per row
+            hashes = self.generate_transaction_hashes(transactions_df)
+
+            new_df = transactions_df.rename(columns={'type': 'transaction_type'}).assign(
+                user_id=user_id,
+                bank_account_id=bank_account_id,
+                original_file_name=file_name,
+                transaction_hash=hashes
+            )
+            if 'category' not in new_df.columns:
+                new_df['category'] = 'Other'
+
+            records = new_df[[
+                'user_id', 'bank_account_id', 'date', 'description', 'amount',
+                'transaction_type', 'category', 'original_file_name', 'transaction_hash'
+            ]].to_dict('records')
+
+            # Let the unique (user_id, transaction_hash) index reject
+            # duplicates instead of pre-SELECTing existing hashes
+            dialect_insert = (
+                sqlite_insert if session.get_bind().dialect.name == 'sqlite' else pg_insert
+            )
+            # Commit per chunk: the WAL can checkpoint as the file streams
+            # in and the journal stays small. A failed chunk only rolls
+            # back itself; re-running the import is safe because ON
+            # CONFLICT skips the rows already committed.
+            saved_count = 0
+            for start in range(0, len(records), 1000):
+                stmt = dialect_insert(Transaction).values(
+                    records[start:start + 1000]
+                ).on_conflict_do_nothing(
+                    index_elements=['user_id', 'transaction_hash']
                 )
-                
-                session.add(transaction)
-                saved_count += 1
-            
-            session.commit()
-            return saved_count, duplicate_count
-            
+                saved_count += session.execute(stmt).rowcount
+                session.commit()
+
+            return saved_count, len(transactions_df) - saved_count
+
         except Exception as e:
             session.rollback()
             raise e
@@ -145,8 +204,12 @@ class TransactionManager(DatabaseManager):
     def get_user_transactions(self, user_id, start_date=None, end_date=None, limit=None):
         """Get transactions for a user"""
         session = self.get_session()
-        query = session.query(Transaction).filter_by(user_id=user_id)
-        
+        # Eager-load the account in one IN() query instead of a lazy
+        # SELECT per transaction when callers touch tx.bank_account
+        query = session.query(Transaction).options(
+            selectinload(Transaction.bank_account)
+        ).filter_by(user_id=user_id)
+
         if start_date:
             query = query.filter(Transaction.date >= start_date)
         if end_date:
@@ -161,24 +224,40 @@ class TransactionManager(DatabaseManager):
     
     def get_transactions_as_dataframe(self, user_id, start_date=None, end_date=None):
         """Get transactions as pandas DataFrame"""
-        transactions = self.get_user_transactions(user_id, start_date, end_date)
-        
-        if not transactions:
+        session = self.get_session()
+
+        # Core select straight into read_sql: no ORM instances, no per-row
+        # dicts, and the join replaces the lazy bank_account lookup
+        stmt = select(
+            Transaction.id,
+            Transaction.date,
+            Transaction.description,
+            Transaction.amount,
+            Transaction.transaction_type.label('type'),
+            Transaction.category,
+            BankAccount.bank_name.label('bank')
+        ).join(
+            BankAccount, Transaction.bank_account_id == BankAccount.id, isouter=True
+        ).where(Transaction.user_id == user_id)
+
+        if start_date:
+            stmt = stmt.where(Transaction.date >= start_date)
+        if end_date:
+            stmt = stmt.where(Transaction.date <= end_date)
+
+        stmt = stmt.order_by(desc(Transaction.date))
+
+        # Stream via fetchmany-backed chunks so peak memory is bounded by
+        # one chunk plus the assembled frame, not a full row list first
+        chunks = pd.read_sql(stmt, session.connection(), chunksize=10000)
+        df = pd.concat(chunks, ignore_index=True)
+
+        if df.empty:
             return pd.DataFrame()
-        
-        data = []
-        for tx in transactions:
-            data.append({
-                'id': tx.id,
-                'date': tx.date,
-                'description': tx.description,
-                'amount': tx.amount,
-                'type': tx.transaction_type,
-                'category': tx.category,
-                'bank': tx.bank_account.bank_name if tx.bank_account else 'Unknown'
-            })
-        
-        return pd.DataFrame(data)
+
+        df['date'] = pd.to_datetime(df['date'])
+        df['bank'] = df['bank'].fillna('Unknown')
+        return df
     
     def update_transaction_category(self, transaction_id, new_category):
         """Update transaction category"""
@@ -220,9 +299,21 @@ class FileManager(DatabaseManager):
     
     def is_file_processed(self, file_content):
         """Check if file has been processed before"""
-        file_hash = self.generate_file_hash(file_content)
+        return _file_hash_exists(self.generate_file_hash(file_content))
+
+    def get_processed_hashes(self, file_hashes):
+        """Return the subset of the given file hashes already recorded.
+
+        One IN() query instead of a round trip per file for bulk uploads.
+        """
+        if not file_hashes:
+            return set()
         session = self.get_session()
-        return session.query(UploadedFile).filter_by(file_hash=file_hash).first() is not None
+        return {
+            file_hash for (file_hash,) in session.query(UploadedFile.file_hash).filter(
+                UploadedFile.file_hash.in_(list(file_hashes))
+            )
+        }
     
     def record_file_upload(self, user_id, file_name, file_content, bank_detected, transactions_count):
         """Record file upload"""
@@ -242,6 +333,8 @@ class FileManager(DatabaseManager):
             
             session.add(uploaded_file)
             session.commit()
+            # Drop any cached negative result for this hash
+            _file_hash_exists.cache_clear()
             return uploaded_file
         except Exception as e:
             session.rollback()
@@ -250,27 +343,62 @@ class FileManager(DatabaseManager):
 class AnalyticsManager(DatabaseManager):
     """Manages financial analytics and insights"""
     
+    def _month_bucket(self, session):
+        """Dialect-aware month expression; date_trunc is Postgres-only"""
+        if session.get_bind().dialect.name == 'sqlite':
+            return func.strftime('%Y-%m', Transaction.date)
+        return func.date_trunc('month', Transaction.date)
+
     def get_monthly_summary(self, user_id, months=12):
-        """Get monthly financial summary"""
+        """Get monthly financial summary as a DataFrame"""
         session = self.get_session()
-        start_date = datetime.now() - timedelta(days=months * 30)
-        
-        # Get monthly aggregated data
-        monthly_data = session.query(
-            func.date_trunc('month', Transaction.date).label('month'),
+        # Align to the first of the month so the window is exact (30-day
+        # approximations slide ~5 days/year) and index range scans start
+        # on a clean boundary
+        start_date = (
+            datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            - relativedelta(months=months - 1)
+        )
+
+        # Aggregate server-side and read straight into a DataFrame
+        month_bucket = self._month_bucket(session)
+        stmt = select(
+            month_bucket.label('month'),
             Transaction.transaction_type,
             func.sum(Transaction.amount).label('total_amount'),
             func.count(Transaction.id).label('transaction_count')
-        ).filter(
+        ).where(
             Transaction.user_id == user_id,
             Transaction.date >= start_date
         ).group_by(
-            func.date_trunc('month', Transaction.date),
+            month_bucket,
             Transaction.transaction_type
-        ).all()
-        
-        return monthly_data
+        ).order_by('month')
+
+        return pd.read_sql(stmt, session.connection())
     
+    def get_user_stats(self, user_id):
+        """Overall transaction stats plus per-account counts, in two queries"""
+        session = self.get_session()
+
+        count, min_date, max_date = session.query(
+            func.count(Transaction.id),
+            func.min(Transaction.date),
+            func.max(Transaction.date)
+        ).filter(Transaction.user_id == user_id).one()
+
+        account_counts = dict(session.query(
+            Transaction.bank_account_id,
+            func.count(Transaction.id)
+        ).filter(Transaction.user_id == user_id).group_by(Transaction.bank_account_id))
+
+        return {
+            'count': count,
+            'min_date': min_date,
+            'max_date': max_date,
+            'account_counts': account_counts
+        }
+
     def get_category_summary(self, user_id, start_date=None, end_date=None):
         """Get category-wise spending summary"""
         session = self.get_session()
@@ -292,20 +420,26 @@ class AnalyticsManager(DatabaseManager):
         return query.group_by(Transaction.category).order_by(desc('total_amount')).all()
     
     def get_spending_trends(self, user_id, category=None):
-        """Get spending trends for analysis"""
+        """Get spending trends for analysis as a DataFrame"""
         session = self.get_session()
-        query = session.query(
-            func.date_trunc('week', Transaction.date).label('week'),
+        if session.get_bind().dialect.name == 'sqlite':
+            week_bucket = func.strftime('%Y-%W', Transaction.date)
+        else:
+            week_bucket = func.date_trunc('week', Transaction.date)
+
+        stmt = select(
+            week_bucket.label('week'),
             func.sum(Transaction.amount).label('total_amount')
-        ).filter(
+        ).where(
             Transaction.user_id == user_id,
             Transaction.transaction_type == 'debit'
         )
-        
+
         if category:
-            query = query.filter(Transaction.category == category)
-        
-        return query.group_by(func.date_trunc('week', Transaction.date)).order_by('week').all()
+            stmt = stmt.where(Transaction.category == category)
+
+        stmt = stmt.group_by(week_bucket).order_by('week')
+        return pd.read_sql(stmt, session.connection())
 
 # Convenience functions
 def init_db():
@@ -316,10 +450,8 @@ def get_default_user():
     """Get or create default user for single-user setup"""
     user_mgr = UserManager()
     try:
-        user = user_mgr.create_or_get_user()
-        # Make sure we have a fresh session
-        session = user_mgr.get_session()
-        session.refresh(user)
-        return user
+        # expire_on_commit=False keeps the instance loaded after commit,
+        # so no refresh round trip is needed
+        return user_mgr.create_or_get_user()
     finally:
         user_mgr.close_session()
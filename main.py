@@ -1,9 +1,12 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 import plotly as px
 
 from parser.bank_parser import BankParser
@@ -17,7 +20,7 @@ from database.operations import (
     FileManager, AnalyticsManager, get_default_user
 )
 from database.models import get_session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 
 # Page configuration
 st.set_page_config(
@@ -53,12 +56,20 @@ if 'uploaded_files' not in st.session_state:
 if 'current_page' not in st.session_state:
     st.session_state.current_page = "Upload"
 
-# Initialize components
-bank_parser = BankParser()
-categorizer = TransactionCategorizer()
-analyzer = FinancialAnalyzer()
-visualizations = DashboardVisualizations()
-insights = InsightsGenerator()
+# Initialize components once per process; cache_resource shares them
+# across sessions and reruns instead of rebuilding keyword tables and
+# compiled patterns
+@st.cache_resource
+def _get_components():
+    return (
+        BankParser(),
+        TransactionCategorizer(),
+        FinancialAnalyzer(),
+        DashboardVisualizations(),
+        InsightsGenerator()
+    )
+
+bank_parser, categorizer, analyzer, visualizations, insights = _get_components()
 
 def main():
     st.title("💰 Comprehensive Finance Tracker")
@@ -121,6 +132,39 @@ def upload_page():
         if st.button("Process Files", type="primary"):
             process_uploaded_files(uploaded_files)
 
+@st.cache_data(show_spinner=False)
+def _parse_and_categorize(file_bytes, file_name):
+    """Parse and categorize one uploaded file, memoized on its content"""
+    transactions = bank_parser.parse_file(file_bytes, file_name)
+    if transactions.empty:
+        return transactions
+    return categorizer.categorize_transactions(transactions)
+
+def _parse_worker(item):
+    """Parse one (bytes, name) pair, trapping errors so a bad file in a
+    parallel batch doesn't abort its siblings"""
+    file_bytes, file_name = item
+    try:
+        return _parse_and_categorize(file_bytes, file_name)
+    except Exception as e:
+        return e
+
+@st.cache_data(show_spinner=False)
+def _fetch_transactions(user_id):
+    """Load a user's transactions once per rerun cycle, memoized"""
+    with TransactionManager() as tx_mgr:
+        df = tx_mgr.get_transactions_as_dataframe(user_id)
+
+    # Low-cardinality columns as categoricals: int8 codes instead of a
+    # Python str per cell, so copies and == masks get much cheaper
+    if not df.empty:
+        for col in ('type', 'bank', 'category'):
+            df[col] = df[col].astype('category')
+        # Date-sorted so pages can slice windows with searchsorted
+        df = df.sort_values('date', ignore_index=True)
+
+    return df
+
 def process_uploaded_files(uploaded_files):
     """Process uploaded bank statement files with database storage"""
     if not st.session_state.db_initialized or not st.session_state.current_user:
@@ -135,67 +179,83 @@ def process_uploaded_files(uploaded_files):
     total_duplicates = 0
     
     with TransactionManager() as tx_mgr, BankAccountManager() as bank_mgr, FileManager() as file_mgr:
-        for i, uploaded_file in enumerate(uploaded_files):
-            status_text.text(f"Processing {uploaded_file.name}...")
-            progress_bar.progress((i + 1) / len(uploaded_files))
-            
+        # Read everything up front and skip files already processed; one
+        # batched hash query instead of a DB round trip per file
+        contents = [(f.read(), f.name) for f in uploaded_files]
+        hashes = [file_mgr.generate_file_hash(data) for data, _ in contents]
+        already_processed = file_mgr.get_processed_hashes(hashes)
+
+        pending = []
+        for (file_content, file_name), file_hash in zip(contents, hashes):
+            if file_hash in already_processed:
+                st.warning(f"⚠️ {file_name} was already processed before")
+            else:
+                pending.append((file_content, file_name))
+
+        # Parse independent files in parallel; the DB writes below stay on
+        # this thread. Parsing is cached on content (see _parse_and_categorize)
+        if pending:
+            status_text.text(f"Parsing {len(pending)} file(s)...")
+            with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+                parsed = list(executor.map(_parse_worker, pending))
+        else:
+            parsed = []
+
+        for i, ((file_content, file_name), transactions) in enumerate(zip(pending, parsed)):
+            status_text.text(f"Saving {file_name}...")
+            progress_bar.progress((i + 1) / len(pending))
+
+            if isinstance(transactions, Exception):
+                st.error(f"❌ Error processing {file_name}: {str(transactions)}")
+                continue
+
             try:
-                # Check if file was already processed
-                file_content = uploaded_file.read()
-                uploaded_file.seek(0)  # Reset file pointer
-                
-                if file_mgr.is_file_processed(file_content):
-                    st.warning(f"⚠️ {uploaded_file.name} was already processed before")
-                    continue
-                
-                # Parse the file
-                transactions = bank_parser.parse_file(uploaded_file)
-                
                 if not transactions.empty:
-                    # Categorize transactions
-                    transactions = categorizer.categorize_transactions(transactions)
-                    
-                    # Detect bank format for account creation
-                    bank_format = bank_parser.detect_bank_format(str(file_content))
-                    
+                    # Detect bank format for account creation. str(bytes)
+                    # would build a huge b'\xNN...' literal; decode a
+                    # bounded sample instead
+                    sample = file_content[:65536].decode('utf-8', errors='ignore').lower()
+                    bank_format = bank_parser.detect_bank_format(sample)
+
                     # Create or get bank account
                     bank_account = bank_mgr.create_or_get_account(
                         user_id=user_id,
                         bank_name=bank_format,
                         account_name="Primary"
                     )
-                    
+
                     # Save transactions to database
                     saved_count, duplicate_count = tx_mgr.save_transactions(
                         transactions_df=transactions,
                         user_id=user_id,
                         bank_account_id=bank_account.id,
-                        file_name=uploaded_file.name
+                        file_name=file_name
                     )
-                    
+
                     # Record file upload
                     file_mgr.record_file_upload(
                         user_id=user_id,
-                        file_name=uploaded_file.name,
+                        file_name=file_name,
                         file_content=file_content,
                         bank_detected=bank_format,
                         transactions_count=saved_count
                     )
-                    
+
                     total_saved += saved_count
                     total_duplicates += duplicate_count
-                    
-                    st.success(f"✅ Processed {uploaded_file.name}: {saved_count} new transactions, {duplicate_count} duplicates skipped")
+
+                    st.success(f"✅ Processed {file_name}: {saved_count} new transactions, {duplicate_count} duplicates skipped")
                 else:
-                    st.warning(f"⚠️ No transactions found in {uploaded_file.name}")
-                    
+                    st.warning(f"⚠️ No transactions found in {file_name}")
+
             except Exception as e:
-                st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
+                st.error(f"❌ Error processing {file_name}: {str(e)}")
     
     if total_saved > 0:
         st.success(f"🎉 Successfully saved {total_saved} new transactions to database!")
-        
+
         # Refresh session data from database
+        _fetch_transactions.clear()
         load_transactions_from_database()
         
         # Show summary
@@ -212,12 +272,27 @@ def load_transactions_from_database():
         return
     
     try:
-        with TransactionManager() as tx_mgr:
-            df = tx_mgr.get_transactions_as_dataframe(st.session_state.current_user.id)
-            st.session_state.transactions_df = df
+        st.session_state.transactions_df = _fetch_transactions(st.session_state.current_user.id)
     except Exception as e:
         st.error(f"Error loading transactions: {e}")
 
+@st.cache_data(show_spinner=False)
+def _dashboard_aggregates(df, start_date, end_date):
+    """Filter to the date window and compute headline totals in one
+    groupby pass; memoized so widget interaction doesn't recompute"""
+    # The frame is date-sorted at load, so the window is two binary
+    # searches instead of full-column comparisons
+    dates = df['date'].to_numpy()
+    lo = np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)))
+    hi = np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), side='right')
+    filtered_df = df.iloc[lo:hi]
+
+    totals = filtered_df.groupby('type', observed=True)['amount'].sum()
+    total_income = float(totals.get('credit', 0.0))
+    total_expenses = abs(float(totals.get('debit', 0.0)))
+
+    return filtered_df, total_income, total_expenses
+
 def dashboard_page():
     st.header("📊 Financial Dashboard")
     
@@ -245,25 +320,22 @@ def dashboard_page():
             max_value=datetime.now().date()
         )
     
-    # Filter data by date range
-    mask = (df['date'] >= pd.Timestamp(start_date)) & (df['date'] <= pd.Timestamp(end_date))
-    filtered_df = df.loc[mask]
-    
+    # Filter data by date range and aggregate once
+    filtered_df, total_income, total_expenses = _dashboard_aggregates(df, start_date, end_date)
+
     if filtered_df.empty:
         st.warning("No transactions found in the selected date range.")
         return
-    
+
     # Key metrics
     col1, col2, col3, col4 = st.columns(4)
-    
+
     with col1:
-        total_income = filtered_df[filtered_df['type'] == 'credit']['amount'].sum()
         st.metric("Total Income", f"${total_income:,.2f}")
-    
+
     with col2:
-        total_expenses = abs(filtered_df[filtered_df['type'] == 'debit']['amount'].sum())
         st.metric("Total Expenses", f"${total_expenses:,.2f}")
-    
+
     with col3:
         net_savings = total_income - total_expenses
         st.metric("Net Savings", f"${net_savings:,.2f}")
@@ -297,7 +369,8 @@ def dashboard_page():
     
     # Recent transactions
     st.subheader("🔍 Recent Transactions")
-    recent_transactions = filtered_df.sort_values('date', ascending=False).head(20)
+    # Partial select of the newest 20 rows instead of a full sort
+    recent_transactions = filtered_df.nlargest(20, 'date')
     st.dataframe(
         recent_transactions[['date', 'description', 'category', 'amount', 'type']],
         use_container_width=True
@@ -367,33 +440,33 @@ def database_management_page():
     # Database statistics
     st.subheader("📊 Database Statistics")
     
-    with TransactionManager() as tx_mgr, BankAccountManager() as bank_mgr, AnalyticsManager() as analytics_mgr:
-        # Get transaction count
-        all_transactions = tx_mgr.get_user_transactions(user_id)
-        transaction_count = len(all_transactions)
-        
+    with BankAccountManager() as bank_mgr, AnalyticsManager() as analytics_mgr:
+        # Aggregate counts and date range in SQL instead of loading every
+        # transaction into Python
+        stats = analytics_mgr.get_user_stats(user_id)
+
         # Get bank accounts
         bank_accounts = bank_mgr.get_user_accounts(user_id)
-        
+
         # Display metrics
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Transactions", transaction_count)
+            st.metric("Total Transactions", stats['count'])
         with col2:
             st.metric("Bank Accounts", len(bank_accounts))
         with col3:
-            if all_transactions:
-                date_range = abs((all_transactions[0].date - all_transactions[-1].date).days)
+            if stats['count']:
+                date_range = abs((stats['max_date'] - stats['min_date']).days)
                 st.metric("Date Range (Days)", date_range)
             else:
                 st.metric("Date Range", "No data")
-    
+
     # Bank accounts management
     st.subheader("🏦 Bank Accounts")
     if bank_accounts:
         accounts_data = []
         for account in bank_accounts:
-            tx_count = len([tx for tx in all_transactions if tx.bank_account_id == account.id])
+            tx_count = stats['account_counts'].get(account.id, 0)
             accounts_data.append({
                 'Bank': account.bank_name.replace('_', ' ').title(),
                 'Account Name': account.account_name,
@@ -413,6 +486,7 @@ def database_management_page():
     
     with col1:
         if st.button("🔄 Refresh Data", help="Reload transactions from database"):
+            _fetch_transactions.clear()
             load_transactions_from_database()
             st.success("Data refreshed successfully!")
     
@@ -426,10 +500,21 @@ def database_management_page():
     st.subheader("📁 Recent File Uploads")
     try:
         from database.models import UploadedFile
-        session = get_session()
-        recent_files = session.query(UploadedFile).filter_by(user_id=user_id).order_by(UploadedFile.uploaded_at.desc()).limit(10).all()
-        session.close()
-        
+        # Context-managed session and only the columns the table shows
+        with get_session() as session:
+            recent_files = session.execute(
+                select(
+                    UploadedFile.file_name,
+                    UploadedFile.bank_detected,
+                    UploadedFile.transactions_count,
+                    UploadedFile.uploaded_at,
+                    UploadedFile.processing_status
+                ).where(UploadedFile.user_id == user_id)
+                .order_by(UploadedFile.uploaded_at.desc())
+                .limit(10)
+            ).all()
+
+
         if recent_files:
             files_data = []
             for file_record in recent_files:
@@ -464,14 +549,16 @@ def export_page():
     
     with col1:
         st.subheader("CSV Export")
-        csv_buffer = io.StringIO()
-        df.to_csv(csv_buffer, index=False)
-        
+        # Compress on the way out: the payload is typically several times
+        # smaller and the buffer doesn't hold the raw CSV string
+        csv_buffer = io.BytesIO()
+        df.to_csv(csv_buffer, index=False, compression='gzip')
+
         st.download_button(
-            label="Download CSV",
+            label="Download CSV (gzip)",
             data=csv_buffer.getvalue(),
-            file_name=f"transactions_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
+            file_name=f"transactions_{datetime.now().strftime('%Y%m%d')}.csv.gz",
+            mime="application/gzip"
         )
     
     with col2:
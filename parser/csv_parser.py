@@ -1,10 +1,22 @@
 import pandas as pd
 import io
-from datetime import datetime
+import re
 
 class CSVParser:
     """Parser for CSV bank statements"""
-    
+
+    # Files larger than this are read in 50k-row chunks
+    stream_threshold_bytes = 8 * 1024 * 1024
+
+    # Deletion table for currency formatting, applied in one pass per value
+    _CURRENCY_STRIP = str.maketrans('', '', ',$₹')
+
+    date_formats = (
+        '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y',
+        '%m-%d-%Y', '%d-%m-%Y', '%Y/%m/%d',
+        '%m/%d/%y', '%d/%m/%y', '%y-%m-%d'
+    )
+
     def __init__(self):
         self.bank_column_mappings = {
             'chase': {
@@ -48,205 +60,204 @@ class CSVParser:
     def parse_csv(self, uploaded_file):
         """Parse CSV bank statement"""
         try:
-            # Read CSV file
             csv_content = uploaded_file.read()
-            df = pd.read_csv(io.StringIO(csv_content.decode('utf-8')))
-            
-            # Detect bank format from columns
-            bank_format = self._detect_bank_from_columns(df.columns.tolist())
-            
+
+            # Pass 1: header-only sniff to detect the bank format without
+            # materializing the file as a DataFrame (or a decoded str)
+            header = pd.read_csv(io.BytesIO(csv_content), nrows=0)
+            bank_format = self._detect_bank_from_columns(header.columns.tolist())
+
+            # Pass 2: full read straight from the bytes; the C engine
+            # strips thousands separators natively, and for known banks
+            # only the mapped columns are loaded
+            usecols = None
+            if bank_format != 'unknown':
+                mapped = {
+                    name
+                    for names in self.bank_column_mappings.get(bank_format, {}).values()
+                    for name in names
+                }
+                usecols = [col for col in header.columns if col in mapped] or None
+
             if bank_format == 'unknown':
-                return self._parse_generic_csv(df)
-            
-            # Parse based on detected bank format
-            return self._parse_bank_specific_csv(df, bank_format)
-            
+                parse = self._parse_generic_csv
+            else:
+                parse = lambda chunk: self._parse_bank_specific_csv(chunk, bank_format)
+
+            # Stream large files in chunks so the working set is bounded
+            # by chunk size, not file size
+            if len(csv_content) > self.stream_threshold_bytes:
+                reader = pd.read_csv(
+                    io.BytesIO(csv_content), usecols=usecols, thousands=',',
+                    chunksize=50000
+                )
+                return pd.concat(
+                    [parse(chunk) for chunk in reader], ignore_index=True
+                )
+
+            df = pd.read_csv(io.BytesIO(csv_content), usecols=usecols, thousands=',')
+            return parse(df)
+
         except Exception as e:
             raise Exception(f"Error parsing CSV: {str(e)}")
     
+    # Single compiled pass over the joined header instead of one
+    # substring scan per bank keyword
+    _column_re = re.compile(
+        r'(?P<chase>transaction date|chase)|'
+        r'(?P<wells_fargo>wells)|'
+        r'(?P<bank_of_america>bofa|bankofamerica)|'
+        r'(?P<citibank>citi)|'
+        r'(?P<hdfc>narration|hdfc)|'
+        r'(?P<axis>particulars|tran date)',
+        re.IGNORECASE
+    )
+    _bank_priority = ('chase', 'wells_fargo', 'bank_of_america', 'citibank', 'hdfc', 'axis')
+
     def _detect_bank_from_columns(self, columns):
         """Detect bank from CSV column names"""
-        columns_lower = [col.lower() for col in columns]
-        columns_str = ' '.join(columns_lower)
-        
-        # Check for specific bank patterns in column names
-        if 'transaction date' in columns_str or any('chase' in col for col in columns_lower):
-            return 'chase'
-        elif any('wells' in col for col in columns_lower):
-            return 'wells_fargo'
-        elif any('bofa' in col or 'bankofamerica' in col for col in columns_lower):
-            return 'bank_of_america'
-        elif any('citi' in col for col in columns_lower):
-            return 'citibank'
-        elif 'narration' in columns_str or any('hdfc' in col for col in columns_lower):
-            return 'hdfc'
-        elif 'particulars' in columns_str or 'tran date' in columns_str:
-            return 'axis'
-        
+        columns_str = ' '.join(columns)
+        found = {match.lastgroup for match in self._column_re.finditer(columns_str)}
+
+        for bank in self._bank_priority:
+            if bank in found:
+                return bank
+
         return 'unknown'
     
     def _parse_bank_specific_csv(self, df, bank_format):
         """Parse CSV based on specific bank format"""
         column_mapping = self.bank_column_mappings.get(bank_format, {})
-        
-        transactions = []
-        
-        for _, row in df.iterrows():
-            try:
-                # Extract date
-                date_col = self._find_column(row, column_mapping.get('date', []))
-                if not date_col:
-                    continue
-                
-                date = self._parse_date(row[date_col])
-                if not date:
-                    continue
-                
-                # Extract description
-                desc_col = self._find_column(row, column_mapping.get('description', []))
-                description = str(row[desc_col]) if desc_col else 'Unknown'
-                
-                # Extract amount and type
-                amount, trans_type = self._extract_amount_and_type(row, column_mapping, bank_format)
-                
-                if amount is not None and amount != 0:
-                    transactions.append({
-                        'date': date,
-                        'description': description.strip(),
-                        'amount': abs(amount),
-                        'type': trans_type,
-                        'bank': bank_format
-                    })
-                    
-            except Exception as e:
-                continue  # Skip malformed rows
-        
-        return pd.DataFrame(transactions)
-    
+
+        # Resolve column names once, then work on whole columns
+        date_col = self._find_column(df.columns, column_mapping.get('date', []))
+        if not date_col:
+            return pd.DataFrame()
+
+        dates = self._parse_dates(df[date_col])
+
+        desc_col = self._find_column(df.columns, column_mapping.get('description', []))
+        if desc_col:
+            descriptions = df[desc_col].astype(str).str.strip()
+        else:
+            descriptions = pd.Series('Unknown', index=df.index)
+
+        amounts, types = self._extract_amounts_and_types(df, column_mapping, bank_format)
+
+        valid = dates.notna() & amounts.notna() & (amounts != 0)
+
+        return pd.DataFrame({
+            'date': dates[valid],
+            'description': descriptions[valid],
+            'amount': amounts[valid].abs(),
+            'type': types[valid],
+            'bank': bank_format
+        }).reset_index(drop=True)
+
     def _parse_generic_csv(self, df):
         """Generic CSV parsing for unknown formats"""
-        transactions = []
-        
         # Try to identify columns by common names
         date_cols = [col for col in df.columns if any(word in col.lower() for word in ['date', 'time'])]
         desc_cols = [col for col in df.columns if any(word in col.lower() for word in ['description', 'narration', 'particulars', 'memo'])]
         amount_cols = [col for col in df.columns if any(word in col.lower() for word in ['amount', 'debit', 'credit'])]
-        
+
         if not date_cols or not desc_cols or not amount_cols:
             raise Exception("Could not identify required columns in CSV")
-        
-        date_col = date_cols[0]
-        desc_col = desc_cols[0]
-        
-        for _, row in df.iterrows():
-            try:
-                # Parse date
-                date = self._parse_date(row[date_col])
-                if not date:
-                    continue
-                
-                # Get description
-                description = str(row[desc_col])
-                
-                # Try to get amount from different columns
-                amount = None
-                trans_type = 'debit'
-                
-                for amount_col in amount_cols:
-                    val = row[amount_col]
-                    if pd.notna(val) and str(val).strip() != '':
-                        try:
-                            amount = float(str(val).replace(',', '').replace('$', '').replace('₹', ''))
-                            if 'credit' in amount_col.lower():
-                                trans_type = 'credit'
-                            elif amount > 0 and 'debit' not in amount_col.lower():
-                                trans_type = 'credit'
-                            break
-                        except ValueError:
-                            continue
-                
-                if amount is not None and amount != 0:
-                    transactions.append({
-                        'date': date,
-                        'description': description.strip(),
-                        'amount': abs(amount),
-                        'type': trans_type,
-                        'bank': 'unknown'
-                    })
-                    
-            except Exception as e:
+
+        dates = self._parse_dates(df[date_cols[0]])
+        descriptions = df[desc_cols[0]].astype(str).str.strip()
+
+        # First parseable amount column wins per row; the column that
+        # supplied the value decides the type
+        amounts = pd.Series(float('nan'), index=df.index)
+        types = pd.Series('debit', index=df.index)
+
+        for amount_col in amount_cols:
+            values = self._clean_amounts(df[amount_col])
+            filled = amounts.isna() & values.notna()
+            if not filled.any():
                 continue
-        
-        return pd.DataFrame(transactions)
-    
-    def _find_column(self, row, possible_names):
+            col_lower = amount_col.lower()
+            if 'credit' in col_lower:
+                types[filled] = 'credit'
+            elif 'debit' not in col_lower:
+                types[filled & (values > 0)] = 'credit'
+            amounts = amounts.fillna(values)
+
+        valid = dates.notna() & amounts.notna() & (amounts != 0)
+
+        return pd.DataFrame({
+            'date': dates[valid],
+            'description': descriptions[valid],
+            'amount': amounts[valid].abs(),
+            'type': types[valid],
+            'bank': 'unknown'
+        }).reset_index(drop=True)
+
+    def _find_column(self, columns, possible_names):
         """Find the first existing column from a list of possible names"""
         for name in possible_names:
-            if name in row.index:
+            if name in columns:
                 return name
         return None
-    
-    def _extract_amount_and_type(self, row, column_mapping, bank_format):
-        """Extract amount and transaction type from row"""
-        amount_cols = column_mapping.get('amount', [])
-        
+
+    def _clean_amounts(self, series):
+        """Parse an amount column to floats, stripping currency formatting"""
+        # Fast path: read_csv's thousands handling usually yields numeric
+        # columns already, so skip the string round trip entirely
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype('float64')
+
+        cleaned = series.astype(str).str.strip().str.translate(self._CURRENCY_STRIP)
+        return pd.to_numeric(cleaned, errors='coerce')
+
+    def _extract_amounts_and_types(self, df, column_mapping, bank_format):
+        """Extract amount and type columns for the whole frame at once"""
+        amount_cols = [c for c in column_mapping.get('amount', []) if c in df.columns]
+
+        amounts = pd.Series(float('nan'), index=df.index)
+        types = pd.Series('debit', index=df.index)
+
         # Handle banks with separate debit/credit columns
         if bank_format in ['citibank', 'hdfc', 'axis']:
-            debit_val = None
-            credit_val = None
-            
-            for col in amount_cols:
-                if col in row.index:
-                    val = row[col]
-                    if pd.notna(val) and str(val).strip() != '':
-                        try:
-                            amount = float(str(val).replace(',', '').replace('$', '').replace('₹', ''))
-                            if 'debit' in col.lower():
-                                debit_val = amount
-                            elif 'credit' in col.lower():
-                                credit_val = amount
-                            else:
-                                # Generic amount column
-                                return abs(amount), 'debit' if amount < 0 else 'credit'
-                        except ValueError:
-                            continue
-            
-            if debit_val is not None and debit_val > 0:
-                return debit_val, 'debit'
-            elif credit_val is not None and credit_val > 0:
-                return credit_val, 'credit'
-        
-        # Handle banks with single amount column
+            debit_col = next((c for c in amount_cols if 'debit' in c.lower()), None)
+            credit_col = next((c for c in amount_cols if 'credit' in c.lower()), None)
+
+            if debit_col is not None:
+                debits = self._clean_amounts(df[debit_col])
+                use_debit = debits.notna() & (debits > 0)
+                amounts[use_debit] = debits[use_debit]
+            if credit_col is not None:
+                credits = self._clean_amounts(df[credit_col])
+                use_credit = amounts.isna() & credits.notna() & (credits > 0)
+                amounts[use_credit] = credits[use_credit]
+                types[use_credit] = 'credit'
+            amount_cols = [c for c in amount_cols if c not in (debit_col, credit_col)]
+
+        # Remaining single signed amount columns: sign decides the type
         for col in amount_cols:
-            if col in row.index:
-                val = row[col]
-                if pd.notna(val) and str(val).strip() != '':
-                    try:
-                        amount = float(str(val).replace(',', '').replace('$', '').replace('₹', ''))
-                        return abs(amount), 'debit' if amount < 0 else 'credit'
-                    except ValueError:
-                        continue
-        
-        return None, 'debit'
+            values = self._clean_amounts(df[col])
+            filled = amounts.isna() & values.notna()
+            types[filled & (values >= 0)] = 'credit'
+            amounts = amounts.fillna(values)
+
+        return amounts, types
     
-    def _parse_date(self, date_str):
-        """Parse date string with flexible formats"""
-        if pd.isna(date_str):
-            return None
-        
-        date_str = str(date_str).strip()
-        
-        date_formats = [
-            '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y',
-            '%m-%d-%Y', '%d-%m-%Y', '%Y/%m/%d',
-            '%m/%d/%y', '%d/%m/%y', '%y-%m-%d'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-        
-        return None
+    def _parse_dates(self, series):
+        """Parse a date column in one pass, cascading through known formats
+
+        A single inferred pass handles the common case; any cells it
+        leaves as NaT get retried per format, so mixed-format files still
+        parse without per-cell strptime ladders.
+        """
+        values = series.astype(str).str.strip()
+        dates = pd.to_datetime(values, errors='coerce')
+
+        for fmt in self.date_formats:
+            missing = dates.isna()
+            if not missing.any():
+                break
+            dates[missing] = pd.to_datetime(values[missing], format=fmt, errors='coerce')
+
+        return dates
 
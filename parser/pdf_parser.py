@@ -1,36 +1,71 @@
 import pandas as pd
+import numpy as np
 import pdfplumber
 import re
-from datetime import datetime
 import io
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+
+
+def _extract_page_batch(pdf_bytes, page_numbers):
+    """Worker: extract text for a batch of 1-based page numbers
+
+    Module-level so it pickles for the process pool; each worker opens
+    its own pdfplumber handle on the shared bytes.
+    """
+    with pdfplumber.open(io.BytesIO(pdf_bytes), pages=list(page_numbers)) as pdf:
+        return [page.extract_text() or '' for page in pdf.pages]
+
 
 class PDFParser:
     """Parser for PDF bank statements"""
-    
+
+    # Statements shorter than this are extracted inline; below it the
+    # process pool's startup cost would dominate
+    parallel_page_threshold = 8
+    _page_batch_size = 5
+
+    # LRU bound for the content-hash parse cache
+    _cache_max_entries = 32
+
+    # Patterns are compiled once at import time; statements are scanned
+    # with the compiled objects instead of re-parsing the pattern per call.
+    # Both generic layouts (full date and MM/DD) are fused into one tagged
+    # alternation so unknown statements get a single full-text scan.
+    _generic_re = re.compile(
+        r'(?P<date1>\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(?P<desc1>.+?)\s+(?P<amount1>-?\$?[\d,]+\.?\d*)|'
+        r'(?P<date2>\d{1,2}/\d{1,2})\s+(?P<desc2>.+?)\s+(?P<amount2>-?\$?[\d,]+\.?\d*)',
+        re.MULTILINE
+    )
+
     def __init__(self):
+        self._parse_cache = OrderedDict()
         self.bank_patterns = {
             'chase': {
-                'transaction_pattern': r'(\d{2}/\d{2})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)',
+                'transaction_pattern': re.compile(r'(\d{2}/\d{2})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)', re.MULTILINE),
                 'date_format': '%m/%d'
             },
             'wells_fargo': {
-                'transaction_pattern': r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)',
+                'transaction_pattern': re.compile(r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)', re.MULTILINE),
                 'date_format': '%m/%d/%Y'
             },
             'bank_of_america': {
-                'transaction_pattern': r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)',
+                'transaction_pattern': re.compile(r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)', re.MULTILINE),
                 'date_format': '%m/%d/%Y'
             },
             'citibank': {
-                'transaction_pattern': r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)',
+                'transaction_pattern': re.compile(r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)', re.MULTILINE),
                 'date_format': '%m/%d/%Y'
             },
             'hdfc': {
-                'transaction_pattern': r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\₹?[\d,]+\.?\d*)',
+                'transaction_pattern': re.compile(r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(-?\₹?[\d,]+\.?\d*)', re.MULTILINE),
                 'date_format': '%d/%m/%Y'
             },
             'axis': {
-                'transaction_pattern': r'(\d{2}-\d{2}-\d{4})\s+(.+?)\s+(-?\₹?[\d,]+\.?\d*)',
+                'transaction_pattern': re.compile(r'(\d{2}-\d{2}-\d{4})\s+(.+?)\s+(-?\₹?[\d,]+\.?\d*)', re.MULTILINE),
                 'date_format': '%d-%m-%Y'
             }
         }
@@ -38,46 +73,82 @@ class PDFParser:
     def parse_pdf(self, uploaded_file):
         """Parse PDF bank statement"""
         try:
-            # Read PDF content
             pdf_bytes = uploaded_file.read()
-            
+
+            # Re-uploads of an identical statement skip the whole
+            # pdfplumber + regex pipeline via a content-hash cache
+            content_hash = hashlib.sha256(pdf_bytes).digest()
+            cached = self._parse_cache.get(content_hash)
+            if cached is not None:
+                self._parse_cache.move_to_end(content_hash)
+                return cached.copy()
+
             with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                full_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_text += page_text + "\n"
+                page_count = len(pdf.pages)
+
+                if page_count >= self.parallel_page_threshold:
+                    # pdfminer's text extraction is GIL-bound pure Python,
+                    # so long statements fan page batches out to worker
+                    # processes; batching amortizes the fork/pickle cost
+                    batches = [
+                        range(start + 1, min(start + self._page_batch_size, page_count) + 1)
+                        for start in range(0, page_count, self._page_batch_size)
+                    ]
+                    with ProcessPoolExecutor() as executor:
+                        results = executor.map(_extract_page_batch, repeat(pdf_bytes), batches)
+                    parts = [text for batch in results for text in batch if text]
+                else:
+                    # Collect per-page text and join once: linear instead
+                    # of quadratic concatenation on long statements
+                    parts = []
+                    for page in pdf.pages:
+                        page_text = page.extract_text()
+                        if page_text:
+                            parts.append(page_text)
+
+                full_text = "\n".join(parts)
             
             # Detect bank format
             bank_format = self._detect_bank_from_pdf(full_text)
-            
+
             if bank_format == 'unknown':
                 # Try generic parsing
-                return self._parse_generic_pdf(full_text)
-            
-            # Parse based on detected bank format
-            return self._parse_bank_specific_pdf(full_text, bank_format)
-            
+                result = self._parse_generic_pdf(full_text)
+            else:
+                # Parse based on detected bank format
+                result = self._parse_bank_specific_pdf(full_text, bank_format)
+
+            # Cache a private copy so callers can mutate what they get back
+            self._parse_cache[content_hash] = result.copy()
+            if len(self._parse_cache) > self._cache_max_entries:
+                self._parse_cache.popitem(last=False)
+
+            return result
+
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
+    # One compiled alternation scans the extracted text once instead of
+    # one substring pass per bank keyword; group names are the bank ids
+    _bank_re = re.compile(
+        r'(?P<chase>chase|jpmorgan)|'
+        r'(?P<wells_fargo>wells fargo)|'
+        r'(?P<bank_of_america>bank of america)|'
+        r'(?P<citibank>citi)|'
+        r'(?P<hdfc>hdfc)|'
+        r'(?P<axis>axis)',
+        re.IGNORECASE
+    )
+    _bank_priority = ('chase', 'wells_fargo', 'bank_of_america', 'citibank', 'hdfc', 'axis')
+
     def _detect_bank_from_pdf(self, text):
         """Detect bank from PDF content"""
-        text_lower = text.lower()
-        
-        if 'chase' in text_lower or 'jpmorgan' in text_lower:
-            return 'chase'
-        elif 'wells fargo' in text_lower:
-            return 'wells_fargo'
-        elif 'bank of america' in text_lower:
-            return 'bank_of_america'
-        elif 'citibank' in text_lower or 'citi' in text_lower:
-            return 'citibank'
-        elif 'hdfc' in text_lower:
-            return 'hdfc'
-        elif 'axis' in text_lower:
-            return 'axis'
-        
+        found = {match.lastgroup for match in self._bank_re.finditer(text)}
+
+        for bank in self._bank_priority:
+            if bank in found:
+                return bank
+
         return 'unknown'
     
     def _parse_bank_specific_pdf(self, text, bank_format):
@@ -86,122 +157,108 @@ class PDFParser:
         if not pattern_info:
             return self._parse_generic_pdf(text)
         
-        transactions = []
-        pattern = pattern_info['transaction_pattern']
+        matches = pattern_info['transaction_pattern'].findall(text)
+        if not matches:
+            return pd.DataFrame()
+
+        date_strs, descriptions, amount_strs = map(list, zip(*matches))
+
+        # One vectorized to_datetime over the whole column instead of a
+        # strptime call per match; unparseable dates coerce to NaT and
+        # those rows are dropped, like the old per-row skip
         date_format = pattern_info['date_format']
-        
-        matches = re.findall(pattern, text, re.MULTILINE)
-        
-        for match in matches:
-            try:
-                date_str, description, amount_str = match
-                
-                # Parse date
-                if len(date_str.split('/')) == 2:  # MM/DD format
-                    current_year = datetime.now().year
-                    date = datetime.strptime(f"{date_str}/{current_year}", f"{date_format}/{current_year}")
-                else:
-                    date = datetime.strptime(date_str, date_format)
-                
-                # Parse amount
-                amount = self._parse_amount(amount_str)
-                
-                # Determine transaction type
-                trans_type = 'debit' if amount < 0 else 'credit'
-                
-                transactions.append({
-                    'date': date,
-                    'description': description.strip(),
-                    'amount': abs(amount),
-                    'type': trans_type,
-                    'bank': bank_format
-                })
-                
-            except Exception as e:
-                continue  # Skip malformed transactions
-        
-        return pd.DataFrame(transactions)
+        dates = pd.to_datetime(pd.Series(date_strs), format=date_format, errors='coerce')
+        if '%Y' not in date_format:
+            dates = self._with_current_year(dates)
+
+        amounts = self._parse_amounts(pd.Series(amount_strs))
+        types = np.where(amounts.to_numpy() < 0, 'debit', 'credit')
+
+        result = pd.DataFrame({
+            'date': dates,
+            'description': pd.Series(descriptions).str.strip(),
+            'amount': amounts.abs(),
+            'type': types,
+            'bank': bank_format
+        })
+        return result[dates.notna()].reset_index(drop=True)
     
     def _parse_generic_pdf(self, text):
         """Generic PDF parsing for unknown formats"""
-        transactions = []
-        
-        # Generic pattern for date, description, amount
-        patterns = [
-            r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)',
-            r'(\d{1,2}/\d{1,2})\s+(.+?)\s+(-?\$?[\d,]+\.?\d*)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.MULTILINE)
-            
-            for match in matches:
-                try:
-                    date_str, description, amount_str = match
-                    
-                    # Parse date
-                    date = self._parse_date_flexible(date_str)
-                    if not date:
-                        continue
-                    
-                    # Parse amount
-                    amount = self._parse_amount(amount_str)
-                    
-                    # Determine transaction type
-                    trans_type = 'debit' if amount < 0 else 'credit'
-                    
-                    transactions.append({
-                        'date': date,
-                        'description': description.strip(),
-                        'amount': abs(amount),
-                        'type': trans_type,
-                        'bank': 'unknown'
-                    })
-                    
-                except Exception as e:
-                    continue
-        
-        return pd.DataFrame(transactions)
+        # One scan; full-date matches are emitted before MM/DD ones, the
+        # same order the old sequential two-pattern pass produced
+        primary, fallback = [], []
+        for match in self._generic_re.finditer(text):
+            if match.group('date1') is not None:
+                primary.append((match.group('date1'), match.group('desc1'), match.group('amount1')))
+            else:
+                fallback.append((match.group('date2'), match.group('desc2'), match.group('amount2')))
+
+        matches = primary + fallback
+        if not matches:
+            return pd.DataFrame()
+
+        date_strs, descriptions, amount_strs = map(list, zip(*matches))
+
+        dates = self._parse_dates(pd.Series(date_strs))
+        amounts = self._parse_amounts(pd.Series(amount_strs))
+        types = np.where(amounts.to_numpy() < 0, 'debit', 'credit')
+
+        result = pd.DataFrame({
+            'date': dates,
+            'description': pd.Series(descriptions).str.strip(),
+            'amount': amounts.abs(),
+            'type': types,
+            'bank': 'unknown'
+        })
+        return result[dates.notna()].reset_index(drop=True)
     
-    def _parse_amount(self, amount_str):
-        """Parse amount string to float"""
-        # Remove currency symbols and spaces
-        cleaned = re.sub(r'[^\d.,-]', '', amount_str)
-        cleaned = cleaned.replace(',', '')
-        
-        # Handle negative amounts
-        is_negative = '-' in amount_str or '(' in amount_str
-        
-        try:
-            amount = float(cleaned)
-            return -amount if is_negative else amount
-        except ValueError:
-            return 0.0
+    # Currency junk and negativity markers, compiled once for the
+    # vectorized amount pass
+    _non_amount_re = re.compile(r'[^\d.,-]')
+    _negative_re = re.compile(r'[-(]')
+
+    def _parse_amounts(self, series):
+        """Parse an amount column to floats in one vectorized pass"""
+        cleaned = series.str.replace(self._non_amount_re, '', regex=True).str.replace(',', '')
+        negative = series.str.contains(self._negative_re, regex=True)
+
+        amounts = pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
+        return amounts.where(~negative, -amounts)
     
-    def _parse_date_flexible(self, date_str):
-        """Parse date with flexible formats"""
-        date_formats = [
-            '%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d',
-            '%m-%d-%Y', '%d-%m-%Y',
-            '%m/%d', '%d/%m'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                if len(date_str.split('/')) == 2 or len(date_str.split('-')) == 2:
-                    # Add current year for MM/DD or DD/MM format
-                    current_year = datetime.now().year
-                    if '/' in fmt:
-                        date_str_with_year = f"{date_str}/{current_year}"
-                        fmt_with_year = f"{fmt}/{current_year}"
-                    else:
-                        date_str_with_year = f"{date_str}-{current_year}"
-                        fmt_with_year = f"{fmt}-{current_year}"
-                    return datetime.strptime(date_str_with_year, fmt_with_year)
-                else:
-                    return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-        
-        return None
+    date_formats = (
+        '%m/%d/%Y', '%d/%m/%Y', '%Y-%m-%d',
+        '%m-%d-%Y', '%d-%m-%Y',
+        '%m/%d', '%d/%m'
+    )
+
+    def _parse_dates(self, series):
+        """Parse a date column in one pass, cascading through known formats
+
+        Each format gets one vectorized to_datetime over the cells the
+        earlier formats left as NaT, replacing the per-row strptime ladder.
+        Year-less formats are re-stamped with the current year, like the
+        old per-row parser appended it.
+        """
+        dates = pd.Series(pd.NaT, index=series.index)
+
+        for fmt in self.date_formats:
+            missing = dates.isna()
+            if not missing.any():
+                break
+            parsed = pd.to_datetime(series[missing], format=fmt, errors='coerce')
+            if '%Y' not in fmt:
+                parsed = self._with_current_year(parsed)
+            dates[missing] = parsed
+
+        return dates
+
+    @staticmethod
+    def _with_current_year(dates):
+        """Re-stamp year-less dates (to_datetime defaults them to 1900)
+        with the current year, in one vectorized assembly"""
+        parts = pd.DataFrame({
+            'year': datetime.now().year, 'month': dates.dt.month, 'day': dates.dt.day
+        })
+        return pd.to_datetime(parts, errors='coerce')
 
@@ -13,20 +13,24 @@ class FinancialAnalyzer:
         if df.empty:
             return pd.DataFrame()
         
-        df = df.copy()
-        df['month'] = df['date'].dt.to_period('M')
-        
-        monthly_summary = df.groupby(['month', 'type']).agg({
+        # datetime64[M] truncation gives an int-backed group key; no boxed
+        # Period object per row, and "YYYY-MM" labels are formatted only
+        # for the handful of resulting months
+        month = pd.Series(
+            df['date'].to_numpy().astype('datetime64[M]'), index=df.index, name='month'
+        )
+
+        monthly_summary = df.groupby([month, 'type']).agg({
             'amount': 'sum'
         }).unstack(fill_value=0)
-        
+
         monthly_summary.columns = ['Credit', 'Debit']
         monthly_summary['Net'] = monthly_summary['Credit'] - monthly_summary['Debit']
         monthly_summary['Savings Rate'] = (monthly_summary['Net'] / monthly_summary['Credit'] * 100).round(2)
-        
+
         monthly_summary.reset_index(inplace=True)
-        monthly_summary['month'] = monthly_summary['month'].astype(str)
-        
+        monthly_summary['month'] = monthly_summary['month'].to_numpy().astype('datetime64[M]').astype(str)
+
         return monthly_summary
     
     def calculate_spending_trends(self, df, periods=['1M', '3M', '6M', '12M']):
@@ -34,34 +38,41 @@ class FinancialAnalyzer:
         if df.empty:
             return {}
         
-        current_date = df['date'].max()
+        # One pass over a date-sorted frame: with cumulative income and
+        # expense sums, each period total is a subtraction at a
+        # searchsorted index instead of a fresh full-frame filter
+        sorted_df = df.sort_values('date')
+        dates = sorted_df['date'].to_numpy()
+        current_date = sorted_df['date'].iat[-1]
+
+        amounts = sorted_df['amount'].to_numpy(np.float64)
+        is_credit = (sorted_df['type'] == 'credit').to_numpy()
+
+        cum_income = np.cumsum(np.where(is_credit, amounts, 0.0))
+        cum_expenses = np.cumsum(np.where(is_credit, 0.0, amounts))
+
+        period_days = {'1M': 30, '3M': 90, '6M': 180, '12M': 365}
         trends = {}
-        
+
         for period in periods:
-            if period == '1M':
-                start_date = current_date - timedelta(days=30)
-            elif period == '3M':
-                start_date = current_date - timedelta(days=90)
-            elif period == '6M':
-                start_date = current_date - timedelta(days=180)
-            elif period == '12M':
-                start_date = current_date - timedelta(days=365)
-            else:
+            days = period_days.get(period)
+            if days is None:
                 continue
-            
-            period_df = df[df['date'] >= start_date]
-            
-            if not period_df.empty:
-                total_spending = period_df[period_df['type'] == 'debit']['amount'].sum()
-                total_income = period_df[period_df['type'] == 'credit']['amount'].sum()
-                
+
+            start_date = current_date - timedelta(days=days)
+            idx = np.searchsorted(dates, np.datetime64(start_date), side='left')
+
+            if idx < len(dates):
+                total_income = cum_income[-1] - (cum_income[idx - 1] if idx > 0 else 0.0)
+                total_spending = cum_expenses[-1] - (cum_expenses[idx - 1] if idx > 0 else 0.0)
+
                 trends[period] = {
                     'spending': total_spending,
                     'income': total_income,
                     'net': total_income - total_spending,
-                    'transaction_count': len(period_df)
+                    'transaction_count': len(dates) - idx
                 }
-        
+
         return trends
     
     def identify_top_categories(self, df, top_n=5):
@@ -80,45 +91,49 @@ class FinancialAnalyzer:
         if df.empty or 'category' not in df.columns:
             return pd.DataFrame()
         
-        df = df.copy()
-        df['month'] = df['date'].dt.to_period('M')
-        
-        # Filter for expenses only
+        # Filter for expenses only, then one long-form groupby on the
+        # filtered rows instead of copying and annotating the whole frame
         expenses_df = df[df['type'] == 'debit']
-        
-        category_monthly = expenses_df.groupby(['month', 'category'])['amount'].sum().unstack(fill_value=0)
-        
-        # Calculate month-over-month change
-        category_trends = category_monthly.pct_change().fillna(0) * 100
-        
-        return category_trends
+
+        # Same int-backed month key as generate_monthly_summary; Periods
+        # are materialized only for the index labels at the end
+        month = pd.Series(
+            expenses_df['date'].to_numpy().astype('datetime64[M]'),
+            index=expenses_df.index, name='month'
+        )
+
+        category_monthly = expenses_df.groupby([month, 'category'])['amount'].sum().unstack(fill_value=0)
+        category_monthly.index = category_monthly.index.to_period('M')
+
+        # Month-over-month change computed in place on the ndarray; same
+        # zero-filled semantics as the old pct_change().fillna(0) pass
+        # without its intermediate shifted copies
+        values = category_monthly.to_numpy(dtype=np.float64)
+        pct = np.zeros_like(values)
+        if len(values) > 1:
+            previous = values[:-1]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pct[1:] = (values[1:] - previous) / previous * 100
+            np.nan_to_num(pct, copy=False, nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+        return pd.DataFrame(pct, index=category_monthly.index, columns=category_monthly.columns)
     
     def detect_unusual_spending(self, df, threshold_multiplier=2.5):
         """Detect unusual spending patterns"""
         if df.empty or 'category' not in df.columns:
             return pd.DataFrame()
         
-        expenses_df = df[df['type'] == 'debit'].copy()
-        
-        # Calculate mean and std for each category
-        category_stats = expenses_df.groupby('category')['amount'].agg(['mean', 'std']).fillna(0)
-        
-        unusual_transactions = []
-        
-        for _, transaction in expenses_df.iterrows():
-            category = transaction['category']
-            amount = transaction['amount']
-            
-            if category in category_stats.index:
-                mean_amount = category_stats.loc[category, 'mean']
-                std_amount = category_stats.loc[category, 'std']
-                
-                if std_amount > 0:
-                    z_score = (amount - mean_amount) / std_amount
-                    if abs(z_score) > threshold_multiplier:
-                        unusual_transactions.append(transaction)
-        
-        return pd.DataFrame(unusual_transactions) if unusual_transactions else pd.DataFrame()
+        expenses_df = df[df['type'] == 'debit']
+
+        # Per-category z-scores in one vectorized pass: transform broadcasts
+        # each category's mean/std back onto the rows, so no per-row lookups
+        grouped = expenses_df.groupby('category')['amount']
+        mean = grouped.transform('mean')
+        std = grouped.transform('std').fillna(0)
+
+        z_scores = np.where(std > 0, (expenses_df['amount'] - mean) / std, 0.0)
+
+        return expenses_df.loc[np.abs(z_scores) > threshold_multiplier]
     
     def calculate_savings_rate(self, df):
         """Calculate savings rate over time"""
@@ -138,30 +153,31 @@ class FinancialAnalyzer:
         if df.empty:
             return {}
         
-        df = df.copy().sort_values('date')
-        
-        income_dates = df[df['type'] == 'credit']['date'].tolist()
-        expense_dates = df[df['type'] == 'debit']['date'].tolist()
-        
-        if not income_dates or not expense_dates:
+        df = df.sort_values('date')
+
+        income_dates = df.loc[df['type'] == 'credit', 'date'].to_numpy()
+        expense_dates = df.loc[df['type'] == 'debit', 'date'].to_numpy()
+
+        if len(income_dates) == 0 or len(expense_dates) == 0:
             return {}
-        
-        # Calculate average days between income and next expenses
-        velocity_data = []
-        
-        for income_date in income_dates:
-            next_expenses = [exp_date for exp_date in expense_dates if exp_date >= income_date]
-            if next_expenses:
-                days_to_spend = (next_expenses[0] - income_date).days
-                velocity_data.append(days_to_spend)
-        
-        if velocity_data:
-            return {
-                'avg_days_to_spend': np.mean(velocity_data),
-                'median_days_to_spend': np.median(velocity_data),
-                'min_days_to_spend': min(velocity_data),
-                'max_days_to_spend': max(velocity_data)
-            }
-        
-        return {}
+
+        # The expense dates are already sorted, so the first expense on or
+        # after each income date is a binary search instead of a scan of
+        # the full expense list per income
+        next_expense = np.searchsorted(expense_dates, income_dates, side='left')
+        has_next = next_expense < len(expense_dates)
+
+        if not has_next.any():
+            return {}
+
+        days_to_spend = (
+            expense_dates[next_expense[has_next]] - income_dates[has_next]
+        ).astype('timedelta64[D]').astype(int)
+
+        return {
+            'avg_days_to_spend': np.mean(days_to_spend),
+            'median_days_to_spend': np.median(days_to_spend),
+            'min_days_to_spend': days_to_spend.min(),
+            'max_days_to_spend': days_to_spend.max()
+        }
 
@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import re
 
 class TransactionCategorizer:
@@ -59,39 +60,78 @@ class TransactionCategorizer:
                 'dividend', 'interest earned', 'refund'
             ]
         }
-    
+
+        # Regex fallbacks, ranked below every keyword category
+        self._fallback_patterns = [
+            ('Banking & Finance', r'\b(?:atm|withdrawal|transfer|payment)\b'),
+            ('Transportation', r'\b(?:gas|fuel|petrol|diesel)\b'),
+            ('Healthcare', r'\b(?:medical|health|medicine)\b')
+        ]
+
+        # One compiled scan replaces the per-keyword substring loop and the
+        # per-fallback re.search calls.  Each category's keywords form a
+        # named group; the lookahead wrapper reports overlapping matches
+        # too, and the lowest-ranked matching group wins — the same order
+        # the old nested loop checked categories in.
+        self._group_category = {}
+        self._group_rank = {}
+        parts = []
+        # Per-category compiled alternations, in priority order, for the
+        # vectorized str.contains path in categorize_transactions
+        self._mask_patterns = []
+        for category, patterns in self.category_patterns.items():
+            name = 'c%d' % len(parts)
+            alternation = '|'.join(re.escape(p.lower()) for p in patterns)
+            parts.append('(?P<%s>%s)' % (name, alternation))
+            self._group_category[name] = category
+            self._group_rank[name] = len(self._group_rank)
+            self._mask_patterns.append((category, re.compile(alternation, re.IGNORECASE)))
+        for category, pattern in self._fallback_patterns:
+            name = 'f%d' % len(parts)
+            parts.append('(?P<%s>%s)' % (name, pattern))
+            self._group_category[name] = category
+            self._group_rank[name] = len(self._group_rank)
+            self._mask_patterns.append((category, re.compile(pattern, re.IGNORECASE)))
+        self._keyword_re = re.compile('(?=%s)' % '|'.join(parts))
+
     def categorize_transactions(self, df):
         """Add category column to transactions DataFrame"""
         if df.empty:
             return df
         
         df = df.copy()
-        df['category'] = df['description'].apply(self._categorize_transaction)
+
+        # One C-level str.contains pass per category instead of a Python
+        # call per row; masks are applied in priority order so the first
+        # matching category wins, exactly like the scalar path
+        descriptions = df['description']
+        categories = np.full(len(df), 'Other', dtype=object)
+        assigned = np.zeros(len(df), dtype=bool)
+
+        for category, pattern in self._mask_patterns:
+            if assigned.all():
+                break
+            mask = descriptions.str.contains(pattern, na=False).to_numpy() & ~assigned
+            categories[mask] = category
+            assigned |= mask
+
+        df['category'] = categories
         return df
     
     def _categorize_transaction(self, description):
         """Categorize a single transaction based on description"""
-        if pd.isna(description):
+        # NaN is the only value unequal to itself, so this avoids the
+        # pd.isna dispatch on the per-row hot path
+        if description is None or description != description:
             return 'Other'
-        
+
         description_lower = str(description).lower()
-        
-        for category, patterns in self.category_patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in description_lower:
-                    return category
-        
-        # Additional pattern matching with regex
-        if re.search(r'\b(atm|withdrawal)\b', description_lower):
-            return 'Banking & Finance'
-        elif re.search(r'\b(transfer|payment)\b', description_lower):
-            return 'Banking & Finance'
-        elif re.search(r'\b(gas|fuel|petrol|diesel)\b', description_lower):
-            return 'Transportation'
-        elif re.search(r'\b(medical|health|medicine)\b', description_lower):
-            return 'Healthcare'
-        
-        return 'Other'
+
+        found = {match.lastgroup for match in self._keyword_re.finditer(description_lower)}
+        if not found:
+            return 'Other'
+
+        return self._group_category[min(found, key=self._group_rank.__getitem__)]
     
     def get_category_summary(self, df):
         """Get summary of transactions by category"""